@@ -228,6 +228,10 @@ setup(
         'pywin32; platform_system=="Windows"',
         'requests'
     ],
+    extras_require={
+        # Faster extraction of OMERO.java.zip by "omero import"
+        'isal': ['isal'],
+    },
     tests_require=[
         'pytest',
         'mox3',
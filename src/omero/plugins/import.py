@@ -26,18 +26,26 @@
 from __future__ import division
 from __future__ import print_function
 
-from builtins import str
-from past.utils import old_div
-from past.builtins import basestring
-from builtins import object
-from io import BytesIO
 import os
 import csv
+import hashlib
 import sys
 import shlex
+import struct
+import tempfile
 import requests
 import re
-from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from zipfile import BadZipFile, ZipFile, ZIP_DEFLATED
+
+try:
+    # Optional SIMD-accelerated DEFLATE, see ImportControl._inflate_isal
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
 
 
 from omero.cli import BaseControl, CLI
@@ -48,6 +56,7 @@ from omero_ext.path import path
 
 START_CLASS = "ome.formats.importer.cli.CommandLineImporter"
 TEST_CLASS = "ome.formats.test.util.TestEngine"
+URI_SCHEME_RE = re.compile(r"^\w+://")
 
 HELP = """Run the Java-based command-line importer
 
@@ -65,11 +74,16 @@ dictionary-like file (e.g. yml or json) can be passed to the `--bulk`
 argument. Most keys in the bulk file will be treated like additional
 command-line arguments. Special keys include:
 
+ * batch        Number of paths passed to each Java process if no columns
+                are specified. Starting one JVM for several paths avoids
+                repeated startup costs. (default: 1)
  * columns      A list of columns for parsing the value of path
  * continue     Like the "-c" changes error handling
  * dry_run      If true, print out additional arguments rather than run them.
                 If another string other than false, use as a template for
-                storing the import commands. (e.g. /tmp/%s.sh)
+                storing the import commands. (e.g. /tmp/%s.sh) Each
+                command is written to a file numbered from 1 or, if the
+                template has no placeholder, all of them to one file.
  * include      Relative path (from the bulk file) of a parent bulk file
  * path         A file which will be parsed line by line based on its file
                 ending. Lines containing zero or more keys along with a
@@ -104,14 +118,49 @@ TESTHELP = """Run the Importer TestEngine suite (devs-only)"""
 DEBUG_CHOICES = ["ALL", "DEBUG", "ERROR", "FATAL", "INFO", "TRACE", "WARN"]
 OUTPUT_CHOICES = ["ids", "legacy", "yaml"]
 SKIP_CHOICES = ['all', 'checksum', 'minmax', 'thumbnails', 'upgrade']
+# Known values of free-form Java arguments, checked before starting Java.
+# Fully qualified class names are always passed through.
+TRANSFER_CHOICES = frozenset((
+    'ln', 'ln_s', 'ln_rm', 'cp', 'cp_rm', 'upload', 'upload_rm'))
+EXCLUDE_CHOICES = frozenset(('clientpath',))
+CHECKSUM_CHOICES = frozenset((
+    'Adler-32', 'CRC-32', 'File-Size-64', 'MD5-128', 'Murmur3-32',
+    'Murmur3-128', 'SHA1-160'))
+SKIP_ARGS = (
+    ('checksum', '--checksum-algorithm=File-Size-64'),
+    ('thumbnails', '--no-thumbnails'),
+    ('minmax', '--no-stats-info'),
+    ('upgrade', '--no-upgrade-check'),
+)
 NO_ARG = object()
 
 OMERO_JAVA_ZIP = (
     'https://downloads.openmicroscopy.org/omero/{version}/OMERO.java.zip'
 )
-
-
-class CommandArguments(object):
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+CLASSPATH_CACHE = '.classpath.cache'
+ZIP_TOPDIR_SAMPLE = 64
+DRY_RUN_WRITERS = 8
+ZIP_LOCAL_HEADER_SIZE = 30
+# Member names which zipfile.extract() rewrites, e.g. absolute paths,
+# "." or ".." components and characters which are not valid on Windows
+ZIP_UNUSUAL_NAME_RE = re.compile(r'[\\:<>|"?*]|(^|/)\.{0,2}(/|$)|[. ](/|$)')
+
+
+@lru_cache(maxsize=None)
+def arg_prefix(key):
+    """
+    Return the flag for key and the prefix for its value, e.g.
+    ("--annotation-ns", "--annotation-ns="). Single letter keys take
+    their value as a separate argument so the prefix is None.
+    """
+    if len(key) == 1:
+        return "-" + key, None
+    flag = "--" + key.replace("_", "-")
+    return flag, flag + "="
+
+
+class CommandArguments:
 
     def __init__(self, ctx, args):
         self.__ctx = ctx
@@ -122,13 +171,21 @@ class CommandArguments(object):
         self.__java_additional = list()
         self.__py_initial = list()
         self.__py_additional = list()
+        # Concatenations of the lists above which only change when
+        # an argument is added. See _prefix_args()
+        self.__prefixes = dict()
+        # Directory against which relative paths are resolved, e.g.
+        # the directory of a bulk file. None for the current directory
+        self.cwd = None
+        # Client JARs of the Java process, set by ImportControl.importer
+        self.classpath = None
         # Python arguments
         self.__py_keys = (
             "javahelp", "skip", "file", "errs", "logback",
             "port", "password", "group", "create", "func",
             "bulk", "prog", "user", "key", "path", "logprefix",
             "JAVA_DEBUG", "quiet", "server", "depth", "clientdir",
-            "fetch_jars",
+            "fetch_jars", "class_sharing", "force",
             "sudo")
         self.set_login_arguments(ctx, args)
         self.set_skip_arguments(args)
@@ -152,28 +209,22 @@ class CommandArguments(object):
     def append_arg(self, cmd_list, key, val=NO_ARG):
         arg_list = self.build_arg_list(key, val)
         cmd_list.extend(arg_list)
+        self.__prefixes.clear()
 
     def reset_arg(self, cmd_list, idx, key, val=NO_ARG):
         arg_list = self.build_arg_list(key, val)
         cmd_list[idx:idx+len(arg_list)] = arg_list
+        self.__prefixes.clear()
 
     def build_arg_list(self, key, val=NO_ARG):
-        arg_list = []
-        if len(key) == 1:
-            arg_list.append("-"+key)
-            if val != NO_ARG:
-                if isinstance(val, basestring):
-                    arg_list.append(val)
+        flag, prefix = arg_prefix(key)
+        if not isinstance(val, str):
+            # NO_ARG or a flag-like value such as True
+            return [flag]
+        elif prefix is None:
+            return [flag, val]
         else:
-            key = key.replace("_", "-")
-            if val == NO_ARG:
-                arg_list.append("--%s" % key)
-            elif isinstance(val, basestring):
-                arg_list.append(
-                    "--%s=%s" % (key, val))
-            else:
-                arg_list.append("--%s" % key)
-        return arg_list
+            return [prefix + val]
 
     def set_path(self, path):
         if not isinstance(path, list):
@@ -181,11 +232,27 @@ class CommandArguments(object):
         else:
             self.path = path
 
+    def _prefix_args(self, name, *cmd_lists):
+        """
+        Return the concatenation of cmd_lists, rebuilding it only if an
+        argument has been added or reset since the last call. In bulk
+        mode only the path and the column values change between rows.
+        """
+        rv = self.__prefixes.get(name)
+        if rv is None:
+            rv = list()
+            for cmd_list in cmd_lists:
+                rv.extend(cmd_list)
+            self.__prefixes[name] = rv
+        return rv
+
+    def _row_args(self):
+        return list(self.path)
+
     def java_args(self):
-        rv = list()
-        rv.extend(self.__java_initial)
-        rv.extend(self.__java_additional)
-        rv.extend(self.path)
+        rv = self._prefix_args(
+            "java", self.__java_initial, self.__java_additional)
+        rv = rv + self._row_args()
         if self.JAVA_DEBUG:
             # Since "args.debug" is used by omero/cli.py itself,
             # uses of "--debug" *after* the `import` command are
@@ -194,17 +261,13 @@ class CommandArguments(object):
         return rv
 
     def initial_args(self):
-        rv = list()
-        rv.extend(self.__py_initial)
-        rv.extend(self.__java_initial)
-        return rv
+        return list(self._prefix_args(
+            "initial", self.__py_initial, self.__java_initial))
 
     def added_args(self):
-        rv = list()
-        rv.extend(self.__py_additional)
-        rv.extend(self.__java_additional)
-        rv.extend(self.path)
-        return rv
+        rv = self._prefix_args(
+            "added", self.__py_additional, self.__java_additional)
+        return rv + self._row_args()
 
     def accepts(self, key):
         return key in self.__accepts
@@ -234,6 +297,64 @@ class CommandArguments(object):
         else:
             self.reset_arg(where, idx, key, val)
 
+    def prepare_columns(self, cols):
+        """
+        Reserve a slot for each of the bulk columns and return a tuple
+        describing where each column value is stored. The returned value
+        is passed to set_columns() for every row so that the arguments
+        do not need to be rebuilt cell by cell.
+        """
+        path_idx = None
+        indexes = list()
+        columns = list()
+        for idx, col in enumerate(cols):
+            if col == "path":
+                path_idx = idx
+                continue
+            self.add(col, "")
+            is_python = col in self.__py_keys
+            if is_python:
+                where = self.__py_additional
+            else:
+                where = self.__java_additional
+            slot = self.__added[col]
+            flag, prefix = arg_prefix(col)
+            if prefix is None:
+                # Short options take their value as a separate argument
+                slot += 1
+                fmt = "%s"
+            else:
+                fmt = prefix + "%s"
+            indexes.append(idx)
+            columns.append((col, where, slot, fmt, is_python))
+        if len(indexes) == 1:
+            # itemgetter only returns a tuple for several items
+            index = indexes[0]
+
+            def getter(parts):
+                return (parts[index],)
+        elif indexes:
+            getter = itemgetter(*indexes)
+        else:
+            def getter(parts):
+                return ()
+        return len(cols), path_idx, getter, columns
+
+    def set_columns(self, prepared, parts):
+        """Apply one row of values using the output of prepare_columns()"""
+        ncols, path_idx, getter, columns = prepared
+        if len(parts) < ncols:
+            self.__ctx.die(
+                203, "Expected %s columns: %s" % (ncols, parts))
+        if path_idx is not None:
+            self.set_path([parts[path_idx]])
+        for column, val in zip(columns, getter(parts)):
+            key, where, slot, fmt, is_python = column
+            if is_python:
+                setattr(self, key, val)
+            where[slot] = fmt % val
+        self.__prefixes.clear()
+
     def set_login_arguments(self, ctx, args):
         """Set the connection arguments"""
 
@@ -262,14 +383,16 @@ class CommandArguments(object):
     def set_skip_values(self, skip):
         """Set the arguments to skip steps during import"""
 
-        if ('all' in skip or 'checksum' in skip):
-            self.__java_initial.append("--checksum-algorithm=File-Size-64")
-        if ('all' in skip or 'thumbnails' in skip):
-            self.__java_initial.append("--no-thumbnails")
-        if ('all' in skip or 'minmax' in skip):
-            self.__java_initial.append("--no-stats-info")
-        if ('all' in skip or 'upgrade' in skip):
-            self.__java_initial.append("--no-upgrade-check")
+        if isinstance(skip, str):
+            # e.g. a single value in a bulk file
+            skip = [skip]
+        skip = frozenset(skip)
+        skip_all = 'all' in skip
+        for name, arg in SKIP_ARGS:
+            if skip_all or name in skip:
+                if arg not in self.__java_initial:
+                    self.__java_initial.append(arg)
+        self.__prefixes.clear()
 
     def open_files(self, mode="w"):
         # Open file handles for stdout/stderr if applicable
@@ -277,15 +400,19 @@ class CommandArguments(object):
         err = self.open_log(self.__args.errs, self.__args.logprefix, mode=mode)
         return out, err
 
+    def resolve(self, file):
+        """Resolve file relative to cwd if one has been set"""
+        if self.cwd:
+            return os.path.join(self.cwd, file)
+        return file
+
     def open_log(self, file, prefix=None, mode="w"):
         if not file:
             return None
         if prefix:
-            file = os.path.sep.join([prefix, file])
-        file = os.path.abspath(file)
-        dir = os.path.dirname(file)
-        if not os.path.exists(dir):
-            os.makedirs(dir)
+            file = os.path.join(prefix, file)
+        file = os.path.abspath(self.resolve(file))
+        os.makedirs(os.path.dirname(file), exist_ok=True)
         return open(file, mode)
 
 
@@ -336,6 +463,14 @@ class ImportControl(BaseControl):
         add_python_argument(
             "--fetch-jars", type=str,
             help="Download OMERO.java jars by version or URL, then exit")
+        add_python_argument(
+            "--class-sharing", action="store_true",
+            help="Speed up Java startup with a class data sharing archive"
+            " stored in the user cache directory. Requires Java 13+")
+        add_python_argument(
+            "--force", action="store_true",
+            help="Pass unknown --transfer, --exclude and"
+            " --checksum-algorithm values to Java without checking them")
 
         # The following arguments are strictly passed to Java
         name_group = parser.add_argument_group(
@@ -518,15 +653,15 @@ class ImportControl(BaseControl):
             omero_java_dir, omero_java_txt = self._userdir_jars()
             client_dir = omero_java_dir
 
-        etc_dir = old_div(self.ctx.dir, "etc")
+        etc_dir = self.ctx.dir / "etc"
         if args.logback:
             xml_file = path(args.logback)
         else:
-            xml_file = old_div(etc_dir, "logback-cli.xml")
+            xml_file = etc_dir / "logback-cli.xml"
 
         classpath = []
         if client_dir and client_dir.exists():
-            classpath = [f.abspath() for f in client_dir.files("*.jar")]
+            classpath = self._get_jars(client_dir)
         if auto_download:
             if classpath:
                 self.ctx.err('Using {}'.format(omero_java_txt.text()))
@@ -540,6 +675,57 @@ class ImportControl(BaseControl):
         logback = "-Dlogback.configurationFile=%s" % xml_file
         return classpath, logback
 
+    def _get_jars(self, client_dir):
+        """
+        Return the absolute paths of the JARs in client_dir. The result
+        is cached in client_dir/.classpath.cache, whose mtime is set to
+        that of client_dir, so that unchanged directories are not
+        rescanned.
+        """
+        base = os.path.abspath(client_dir)
+        cache = os.path.join(base, CLASSPATH_CACHE)
+        try:
+            if os.stat(cache).st_mtime_ns == os.stat(base).st_mtime_ns:
+                with open(cache, "r") as f:
+                    cached = f.read().split("\n")
+                # The entry count and the final newline show that the
+                # file is complete
+                if len(cached) == 4 and cached[0] == base and \
+                        not cached[3]:
+                    classpath = cached[2].split(os.pathsep)
+                    if cached[1] == str(len(classpath)):
+                        return classpath
+        except (IOError, OSError):
+            pass
+
+        # DirEntry objects carry the file type from the directory listing
+        # so this avoids a stat and an abspath() call per JAR
+        classpath = [
+            os.path.join(base, entry.name) for entry in os.scandir(base)
+            if entry.name.endswith(".jar") and entry.is_file()]
+        if classpath:
+            try:
+                # Replace the cache atomically so that a concurrent import
+                # never reads a partial file
+                fd, tmp = tempfile.mkstemp(
+                    dir=base, prefix=CLASSPATH_CACHE, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        f.write("%s\n%s\n%s\n" % (
+                            base, len(classpath), os.pathsep.join(classpath)))
+                    os.replace(tmp, cache)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                # Creating and renaming the file bumps the directory mtime
+                # but setting the mtime of the file does not
+                mtime = os.stat(base).st_mtime_ns
+                os.utime(cache, ns=(mtime, mtime))
+            except (IOError, OSError):
+                # e.g. a read-only installation
+                pass
+        return classpath
+
     def importer(self, args):
         if args.fetch_jars:
             if args.path:
@@ -547,12 +733,16 @@ class ImportControl(BaseControl):
             self.download_omero_java(args.fetch_jars)
             return
 
+        if not args.force:
+            self._check_choices(args)
+
         classpath, logback = self._get_classpath_logback(args)
         if not classpath:
             self.download_omero_java('latest')
             classpath, logback = self._get_classpath_logback(args)
 
         command_args = CommandArguments(self.ctx, args)
+        command_args.classpath = classpath
         xargs = [logback, "-Xmx1024M", "-cp", os.pathsep.join(classpath)]
         xargs.append("-Domero.import.depth=%s" % args.depth)
 
@@ -563,6 +753,43 @@ class ImportControl(BaseControl):
         else:
             self.do_import(command_args, xargs)
 
+    def _check_choices(self, args):
+        """
+        Fail fast on unknown values which would otherwise only be
+        rejected once the JVM has started.
+        """
+        for name, value, choices in (
+                ("transfer", args.transfer, TRANSFER_CHOICES),
+                ("exclude", args.exclude, EXCLUDE_CHOICES),
+                ("checksum-algorithm", args.checksum_algorithm,
+                 CHECKSUM_CHOICES)):
+            if not value:
+                continue
+            for item in value.split(","):
+                if item not in choices and "." not in item:
+                    self.ctx.die(
+                        109, "Unknown --%s value '%s'. Choose from: %s"
+                        " (or use --force)"
+                        % (name, item, ", ".join(sorted(choices))))
+
+    def _class_sharing_args(self, classpath):
+        """
+        Return the JVM arguments for an AppCDS archive of the importer
+        classes. The archive is dumped when the JVM exits the first
+        time a classpath is seen and reused afterwards. Since it is
+        keyed on the classpath, changing the JARs creates a new archive.
+        Called for each launch so that only the first import of a bulk
+        run dumps the archive.
+        """
+        cache_dir = get_omero_user_cache_dir()
+        cache_dir.makedirs_p()
+        key = hashlib.sha1(
+            os.pathsep.join(classpath).encode("utf-8")).hexdigest()
+        jsa = cache_dir / ("omero-import-%s.jsa" % key[:12])
+        if jsa.exists():
+            return ["-XX:SharedArchiveFile=%s" % jsa, "-Xshare:auto"]
+        return ["-XX:ArchiveClassesAtExit=%s" % jsa]
+
     def _userdir_jars(self, parentonly=False):
         user_jars = get_omero_user_cache_dir() / 'jars'
         # Use this file instead of a symlink so it works on all platform
@@ -577,41 +804,186 @@ class ImportControl(BaseControl):
             return None, omero_java_txt
 
     def download_omero_java(self, version_or_uri):
-        if re.match("^\w+://", version_or_uri):
+        if URI_SCHEME_RE.match(version_or_uri):
             omero_java_zip = version_or_uri
         else:
             omero_java_zip = OMERO_JAVA_ZIP.format(version=version_or_uri)
         self.ctx.err("Downloading %s" % omero_java_zip)
         jars_dir, omero_java_txt = self._userdir_jars(parentonly=True)
         jars_dir.makedirs_p()
-        with requests.get(omero_java_zip) as resp:
-            with ZipFile(BytesIO(resp.content)) as zipfile:
-                topdirs = set(f.filename.split(
-                    os.path.sep)[0] for f in zipfile.filelist if f.is_dir())
-                if len(topdirs) != 1:
+        omero_java_etag = jars_dir / 'OMERO.java.etag'
+        headers = self._conditional_headers(
+            omero_java_zip, omero_java_etag, omero_java_txt)
+        # Stream the archive to disk rather than buffering it in memory.
+        # Each download uses its own file so that concurrent imports do
+        # not write to or delete each other's archive.
+        with tempfile.NamedTemporaryFile(
+                dir=jars_dir, prefix='OMERO.java.', suffix='.part',
+                delete=False) as fh:
+            omero_java_part = path(fh.name)
+        try:
+            with requests.get(
+                    omero_java_zip, headers=headers, stream=True) as resp:
+                if resp.status_code == 304:
+                    self.ctx.err(
+                        "Using cached {}".format(omero_java_txt.text()))
+                    return
+                resp.raise_for_status()
+                validators = (
+                    resp.headers.get('ETag', ''),
+                    resp.headers.get('Last-Modified', ''))
+                with open(omero_java_part, 'wb') as fh:
+                    for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        fh.write(chunk)
+            with ZipFile(omero_java_part) as zipfile:
+                # The top directory is taken from the first entry and
+                # checked against a sample of the following entries
+                sample = [name.partition('/') for name in
+                          islice(zipfile.namelist(), ZIP_TOPDIR_SAMPLE)]
+                tops = sorted(set(top for top, sep, rest in sample))
+                # Every sampled name must be below the same directory
+                if len(tops) != 1 or not tops[0] or \
+                        not all(sep for top, sep, rest in sample):
                     self.ctx.die(
                         108,
                         'Expected one top directory in OMERO.java.zip: {}'
-                        .format(topdirs))
-                topdir = topdirs.pop()
+                        .format(tops))
+                topdir = tops[0]
                 if os.path.isabs(topdir):
                     self.ctx.die(
                         108,
                         'Unexpected absolute paths in OMERO.java.zip: {}'
                         .format(topdir))
-                zipfile.extractall(jars_dir)
-                omero_java_txt.write_text(topdir)
+                # A partial extraction must not be revalidated, so the
+                # sidecar is only written back once extraction succeeds
+                if omero_java_etag.exists():
+                    omero_java_etag.remove()
+                # Directories are created up front so that the workers
+                # only ever write files
+                members = []
+                for info in zipfile.infolist():
+                    if info.is_dir():
+                        zipfile.extract(info, jars_dir)
+                    else:
+                        members.append(info.filename)
+            self._extract_parallel(omero_java_part, members, jars_dir)
+            omero_java_txt.write_text(topdir)
+            omero_java_etag.write_lines((omero_java_zip,) + validators)
+        finally:
+            if omero_java_part.exists():
+                os.unlink(omero_java_part)
+
+    def _extract_parallel(self, zip_path, members, dest):
+        """
+        Extract the named members of zip_path into dest using a pool of
+        threads. ZipFile objects cannot be shared between threads so each
+        worker opens its own handle on a slice of the members.
+        """
+        # Unusual names are left to zipfile, which sanitises them for the
+        # platform, and extracted serially on this thread
+        targets = []
+        with ZipFile(zip_path) as zipfile:
+            for name in members:
+                if ZIP_UNUSUAL_NAME_RE.search(name):
+                    zipfile.extract(name, dest)
+                else:
+                    targets.append(
+                        (name, os.path.join(dest, *name.split('/'))))
+        # zipfile.extract() creates missing parents without exist_ok,
+        # which races between workers, so they are all created here
+        for parent in set(os.path.dirname(target) for _, target in targets):
+            os.makedirs(parent, exist_ok=True)
+        workers = min(os.cpu_count() or 1, len(targets)) or 1
+
+        def extract(items):
+            with ZipFile(zip_path) as zipfile:
+                with open(zip_path, "rb") as raw:
+                    for name, target in items:
+                        info = zipfile.getinfo(name)
+                        if not self._inflate_isal(raw, info, target):
+                            zipfile.extract(info, dest)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(extract, targets[i::workers])
+                       for i in range(workers)]
+            for future in futures:
+                future.result()
+
+    def _inflate_isal(self, raw, info, target):
+        """
+        Decompress a DEFLATE member to target with the SIMD-accelerated
+        isal_zlib if it is installed, reading the compressed bytes
+        directly from the archive file handle raw. Returns False if the
+        member should be extracted by zipfile instead.
+        """
+        if isal_zlib is None or info.compress_type != ZIP_DEFLATED:
+            return False
+        if info.flag_bits & 0x1:
+            # Encrypted
+            return False
+
+        raw.seek(info.header_offset)
+        header = raw.read(ZIP_LOCAL_HEADER_SIZE)
+        if header[:4] != b"PK\x03\x04":
+            raise BadZipFile("Bad local header for %s" % info.filename)
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        raw.seek(name_len + extra_len, os.SEEK_CUR)
+
+        decompressor = isal_zlib.decompressobj(-15)
+        crc = 0
+        remaining = info.compress_size
+        with open(target, "wb") as fh:
+            while remaining > 0:
+                chunk = raw.read(min(remaining, DOWNLOAD_CHUNK_SIZE))
+                if not chunk:
+                    raise BadZipFile("Truncated member %s" % info.filename)
+                remaining -= len(chunk)
+                data = decompressor.decompress(chunk)
+                crc = isal_zlib.crc32(data, crc)
+                fh.write(data)
+            data = decompressor.flush()
+            crc = isal_zlib.crc32(data, crc)
+            fh.write(data)
+        if crc != info.CRC:
+            raise BadZipFile("Bad CRC-32 for %s" % info.filename)
+        return True
+
+    def _conditional_headers(self, omero_java_zip, omero_java_etag,
+                             omero_java_txt):
+        """
+        Build the revalidation headers for a previously downloaded
+        OMERO.java.zip. The sidecar file stores the URL followed by the
+        ETag and Last-Modified values returned by the server. Nothing is
+        returned if the URL differs or the extracted jars are missing.
+        """
+        if not omero_java_etag.exists() or not omero_java_txt.exists():
+            return {}
+        topdir = omero_java_txt.text().strip()
+        if not (omero_java_txt.parent / topdir / 'libs').isdir():
+            return {}
+        lines = omero_java_etag.lines(retain=False)
+        if len(lines) != 3 or lines[0] != omero_java_zip:
+            return {}
+        headers = {}
+        if lines[1]:
+            headers['If-None-Match'] = lines[1]
+        if lines[2]:
+            headers['If-Modified-Since'] = lines[2]
+        return headers
 
     def do_import(self, command_args, xargs, mode="w"):
         out = err = None
         try:
 
             import_command = self.COMMAND + command_args.java_args()
+            if command_args.class_sharing:
+                xargs = xargs + self._class_sharing_args(
+                    command_args.classpath)
             out, err = command_args.open_files(mode=mode)
 
             p = omero.java.popen(
                 import_command, debug=False, xargs=xargs,
-                stdout=out, stderr=err)
+                chdir=command_args.cwd, stdout=out, stderr=err)
 
             self.ctx.rv = p.wait()
 
@@ -625,37 +997,43 @@ class ImportControl(BaseControl):
     def bulk_import(self, command_args, xargs):
 
         try:
-            from yaml import safe_load
+            import yaml
         except ImportError:
             self.ctx.die(105, "ERROR: PyYAML is not installed")
-
-        old_pwd = os.getcwd()
+        # Prefer the libyaml bindings when PyYAML was built with them
+        Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+        # Walk the .yml graph looking for includes
+        # and load them all so that the top parent
+        # values can be overwritten. Includes are
+        # resolved relative to the including file.
+        contents = list()
+        bulkfile = os.path.abspath(command_args.bulk)
+        while bulkfile:
+            parent = os.path.dirname(bulkfile)
+            with open(bulkfile, "r") as f:
+                data = yaml.load(f, Loader=Loader)
+                contents.append((bulkfile, parent, data))
+                bulkfile = data.get("include")
+                if bulkfile:
+                    bulkfile = os.path.abspath(
+                        os.path.join(parent, bulkfile))
+                # TODO: included files are updated based on the including
+                # file but other file paths aren't!
+
+        bulk = dict()
+        for bulkfile, parent, data in reversed(contents):
+            bulk.update(data)
+
+        # All other relative paths, including those passed
+        # to Java, are resolved against the initial bulk file
+        command_args.cwd = contents[0][1]
+
+        incr = 0
+        failed = 0
+        total = 0
+        commands = list()
         try:
-
-            # Walk the .yml graph looking for includes
-            # and load them all so that the top parent
-            # values can be overwritten.
-            contents = list()
-            bulkfile = command_args.bulk
-            while bulkfile:
-                bulkfile = os.path.abspath(bulkfile)
-                parent = os.path.dirname(bulkfile)
-                with open(bulkfile, "r") as f:
-                    data = safe_load(f)
-                    contents.append((bulkfile, parent, data))
-                    bulkfile = data.get("include")
-                    os.chdir(parent)
-                    # TODO: included files are updated based on the including
-                    # file but other file paths aren't!
-
-            bulk = dict()
-            for bulkfile, parent, data in reversed(contents):
-                bulk.update(data)
-                os.chdir(parent)
-
-            incr = 0
-            failed = 0
-            total = 0
             for cont in self.parse_bulk(bulk, command_args):
                 incr += 1
                 if command_args.dry_run:
@@ -664,9 +1042,9 @@ class ImportControl(BaseControl):
                     if command_args.dry_run.lower() == "true":
                         self.ctx.out(rv)
                     else:
-                        with open(command_args.dry_run % incr, "w") as o:
-                            # FIXME: this assumes 'omero'
-                            print(sys.argv[0], "import", rv, file=o)
+                        # FIXME: this assumes 'omero'
+                        commands.append(
+                            "%s import %s\n" % (sys.argv[0], rv))
                 else:
                     if incr == 1:
                         mode = "w"
@@ -687,7 +1065,30 @@ class ImportControl(BaseControl):
                 if failed:
                     self.ctx.err("%x failed imports" % failed)
         finally:
-            os.chdir(old_pwd)
+            # Keep the commands collected before any failure
+            if commands:
+                self.write_dry_run(command_args, commands)
+
+    def write_dry_run(self, command_args, commands):
+        """
+        Write the dry-run import commands collected by bulk_import. A
+        template without a % placeholder receives all the commands,
+        otherwise each command is written to its own numbered file.
+        """
+        template = command_args.dry_run
+        if "%" not in template:
+            with open(command_args.resolve(template), "w") as o:
+                o.writelines(commands)
+            return
+
+        def write(item):
+            incr, command = item
+            with open(command_args.resolve(template % incr), "w") as o:
+                o.write(command)
+
+        with ThreadPoolExecutor(max_workers=DRY_RUN_WRITERS) as executor:
+            # Consume the results so that any error is raised here
+            list(executor.map(write, enumerate(commands, 1)))
 
     def parse_bulk(self, bulk, command_args):
         # Known keys with special handling
@@ -718,6 +1119,20 @@ class ImportControl(BaseControl):
         if "columns" in bulk:
             cols = bulk.pop("columns")
 
+        batch = 1
+        if "batch" in bulk:
+            value = bulk.pop("batch")
+            try:
+                # str() rejects floats and booleans which int() accepts
+                batch = int(str(value))
+            except ValueError:
+                batch = 0
+            if batch < 1:
+                self.ctx.die(
+                    110, "batch must be a positive integer: %s" % value)
+            if cols and batch > 1:
+                self.ctx.err("Ignoring batch since columns are specified")
+
         if "include" in bulk:
             bulk.pop("include")
 
@@ -740,15 +1155,23 @@ class ImportControl(BaseControl):
             elif path.endswith(".csv"):
                 function = self.parse_csv
 
-        for parts in function(path):
+        if cols:
+            columns = command_args.prepare_columns(cols)
+
+        paths = list()
+        for parts in function(command_args.resolve(path)):
             if not cols:
-                command_args.set_path(parts)
+                paths.extend(parts)
+                if len(paths) < batch:
+                    continue
+                command_args.set_path(paths)
+                paths = list()
             else:
-                for idx, col in enumerate(cols):
-                    if col == "path":
-                        command_args.set_path([parts[idx]])
-                    else:
-                        command_args.add(col, parts[idx])
+                command_args.set_columns(columns, parts)
+            yield cont
+
+        if paths:
+            command_args.set_path(paths)
             yield cont
 
     def parse_text(self, path, parse=False):
@@ -756,8 +1179,9 @@ class ImportControl(BaseControl):
             for line in o:
                 line = line.strip()
                 if parse:
-                    line = shlex.split(line)
-                yield [line]
+                    yield shlex.split(line)
+                else:
+                    yield [line]
 
     def parse_shlex(self, path):
         for line in self.parse_text(path, parse=True):
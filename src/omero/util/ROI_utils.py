@@ -43,8 +43,6 @@
 from __future__ import division
 from builtins import str
 from builtins import map
-from builtins import range
-from past.utils import old_div
 from builtins import object
 from omero.model.enums import UnitsLength
 from omero.model import LengthI
@@ -57,6 +55,8 @@ from omero.model import PolygonI
 from omero.model import MaskI
 from omero.rtypes import rdouble, rint, rstring
 
+import numpy
+import sys
 import warnings
 #
 # HELPERS
@@ -107,6 +107,27 @@ def xyListToBbox(xyList):
             max(yList)-min(yList))
 
 
+def _pointsToString(pointsList):
+    """
+    Formats [x1, y1, x2, y2, ...] as "x1,y1,x2,y2,...". numpy arrays,
+    e.g. from bulk ROI ingestion, are flattened and converted to Python
+    scalars in C with tolist() before joining.
+    """
+    if isinstance(pointsList, numpy.ndarray):
+        pointsList = pointsList.ravel().tolist()
+    return ','.join(map(str, pointsList))
+
+
+def _pointsToTupleList(pointString):
+    """
+    Parses "x1,y1,x2,y2,..." into [(x1, y1), (x2, y2), ...]. A trailing
+    unpaired token is ignored.
+    """
+    tokens = pointString.split(',')
+    return [(int(tokens[i]), int(tokens[i + 1]))
+            for i in range(0, len(tokens) - 1, 2)]
+
+
 #
 # Data implementation
 #
@@ -116,8 +137,7 @@ def xyListToBbox(xyList):
 #
 #
 def abstract():
-    import inspect
-    caller = inspect.getouterframes(inspect.currentframe())[1][3]
+    caller = sys._getframe(1).f_code.co_name
     raise NotImplementedError(caller + ' must be implemented in subclass')
 
 ##
@@ -128,6 +148,27 @@ def abstract():
 
 class ShapeSettingsData(object):
 
+    __slots__ = ('_strokeColour', 'strokeWidth', 'strokeDashArray',
+                 '_fillColour', 'fillRule', '_colours')
+
+    WHITE = 16777215
+    BLACK = 0
+    GREY = 11184810
+
+    # rtypes are immutable so the default colour is shared by all
+    # instances. The setters always bind new rtypes. The stroke width
+    # is a mutable LengthI and stays per instance.
+    _DEFAULT_COLOUR = rint(GREY)
+
+    # (attribute, shape setter, shape getter) copied to and from the shape
+    _FIELDS = (
+        ('strokeColour', 'setStrokeColor', 'getStrokeColor'),
+        ('strokeWidth', 'setStrokeWidth', 'getStrokeWidth'),
+        ('strokeDashArray', 'setStrokeDashArray', 'getStrokeDashArray'),
+        ('fillColour', 'setFillColor', 'getFillColor'),
+        ('fillRule', 'setFillRule', 'getFillRule'),
+    )
+
     ##
     # Initialises the default values of the ShapeSettings.
     # Stroke has default colour of darkGrey
@@ -137,17 +178,40 @@ class ShapeSettingsData(object):
     def __init__(self):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.WHITE = 16777215
-        self.BLACK = 0
-        self.GREY = 11184810
-        self.strokeColour = rint(self.GREY)
+        self.strokeColour = self._DEFAULT_COLOUR
         self.strokeWidth = LengthI()
         self.strokeWidth.setValue(1)
         self.strokeWidth.setUnit(UnitsLength.POINT)
         self.strokeDashArray = rstring('')
-        self.fillColour = rint(self.GREY)
+        self.fillColour = self._DEFAULT_COLOUR
         self.fillRule = rstring('')
 
+    ##
+    # The stroke colour. Assigning it drops the colour values cached by
+    # getSettings.
+    #
+    @property
+    def strokeColour(self):
+        return self._strokeColour
+
+    @strokeColour.setter
+    def strokeColour(self, colour):
+        self._strokeColour = colour
+        self._colours = None
+
+    ##
+    # The fill colour. Assigning it drops the colour values cached by
+    # getSettings.
+    #
+    @property
+    def fillColour(self):
+        return self._fillColour
+
+    @fillColour.setter
+    def fillColour(self, colour):
+        self._fillColour = colour
+        self._colours = None
+
     ##
     # Applies the settings in the ShapeSettingsData to the ROITypeI
     # @param shape the omero.model.ROITypeI that these settings will
@@ -156,11 +220,8 @@ class ShapeSettingsData(object):
     def setROIShapeSettings(self, shape):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        shape.setStrokeColor(self.strokeColour)
-        shape.setStrokeWidth(self.strokeWidth)
-        shape.setStrokeDashArray(self.strokeDashArray)
-        shape.setFillColor(self.fillColour)
-        shape.setFillRule(self.fillRule)
+        for attr, setter, getter in self._FIELDS:
+            getattr(shape, setter)(getattr(self, attr))
 
     ##
     # Set the Stroke settings of the ShapeSettings.
@@ -203,12 +264,18 @@ class ShapeSettingsData(object):
 
     ##
     # Get the tuple ((stokeColor, strokeWidth), (fillColour)).
+    # The colour values are kept until a colour is assigned. The width
+    # is a mutable LengthI so it is read on every call.
     # @return see above.
     #
     def getSettings(self):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        return (self.getStrokeSettings(), self.getFillSettings())
+        if self._colours is None:
+            self._colours = (self._strokeColour.getValue(),
+                             self._fillColour.getValue())
+        stroke, fill = self._colours
+        return ((stroke, self.strokeWidth.getValue()), fill)
 
     ##
     # Set the current shapeSettings from the ROI roi.
@@ -217,11 +284,8 @@ class ShapeSettingsData(object):
     def getShapeSettingsFromROI(self, roi):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.strokeColour = roi.getStrokeColor()
-        self.strokeWidth = roi.getStrokeWidth()
-        self.strokeDashArray = roi.getStrokeDashArray()
-        self.fillColour = roi.getFillColor()
-        self.fillRule = roi.getFillRule()
+        for attr, setter, getter in self._FIELDS:
+            setattr(self, attr, getattr(roi, getter)())
 
 ##
 # This class stores the ROI Coordinate (Z,T).
@@ -230,6 +294,8 @@ class ShapeSettingsData(object):
 
 class ROICoordinate(object):
 
+    __slots__ = ('theZ', 'theT')
+
     ##
     # Initialise the ROICoordinate.
     # @param z The z-section.
@@ -269,6 +335,8 @@ class ROICoordinate(object):
 
 class ROIDrawingI(object):
 
+    __slots__ = ()
+
     def acceptVisitor(self, visitor):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
@@ -281,6 +349,12 @@ class ROIDrawingI(object):
 
 class ShapeData(object):
 
+    __slots__ = ('coord', 'shapeSettings', 'roi')
+
+    # (attribute, shape setter, shape getter) for the geometry of the
+    # shape, declared by each subclass.
+    _GEOMETRY_FIELDS = ()
+
     ##
     # Constructor sets up the coord, shapeSettings and ROI objects.
     #
@@ -290,7 +364,7 @@ class ShapeData(object):
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         self.coord = ROICoordinate()
         self.shapeSettings = ShapeSettingsData()
-        self.ROI = None
+        self.roi = None
 
     ##
     # Set the coord of the class to coord.
@@ -317,7 +391,18 @@ class ShapeData(object):
     def setROIGeometry(self, roi):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        abstract()
+        self.coord.setROICoord(roi)
+        for attr, setter, getter in self._GEOMETRY_FIELDS:
+            getattr(roi, setter)(getattr(self, attr))
+
+    ##
+    # Alias of setROIGeometry.
+    # @param roi See above.
+    #
+    def setGeometry(self, roi):
+        warnings.warn(
+            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
+        self.setROIGeometry(roi)
 
     ##
     # Set the Settings of the ShapeDate form the settings object.
@@ -365,7 +450,7 @@ class ShapeData(object):
         if(self.roi is not None):
             return self.roi
         self.roi = self.createBaseType()
-        self.setROICoord(self.roi)
+        # setROIGeometry also sets the ROICoordinate
         self.setROIGeometry(self.roi)
         self.setROIShapeSettings(self.roi)
         return self.roi
@@ -395,7 +480,8 @@ class ShapeData(object):
     def getGeometryFromROI(self, roi):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        abstract()
+        for attr, setter, getter in self._GEOMETRY_FIELDS:
+            setattr(self, attr, getattr(roi, getter)())
 
     ##
     # Get all settings from the roi, Geomerty, Shapesettins, ROICoordinate.
@@ -418,6 +504,15 @@ class ShapeData(object):
 
 class EllipseData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('x', 'y', 'radiusX', 'radiusY')
+
+    _GEOMETRY_FIELDS = (
+        ('x', 'setX', 'getX'),
+        ('y', 'setY', 'getY'),
+        ('radiusX', 'setRadiusX', 'getRadiusX'),
+        ('radiusY', 'setRadiusY', 'getRadiusY'),
+    )
+
     ##
     # Constructor for EllipseData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
@@ -426,7 +521,7 @@ class EllipseData(ShapeData, ROIDrawingI):
     # @param radiusX The major axis of the ellipse.
     # @param radiusY The minor axis of the ellipse.
 
-    def __init__(self, roicoord=ROICoordinate(), x=0, y=0, radiusX=0,
+    def __init__(self, roicoord=None, x=0, y=0, radiusX=0,
                  radiusY=0):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
@@ -435,32 +530,10 @@ class EllipseData(ShapeData, ROIDrawingI):
         self.y = rdouble(y)
         self.radiusX = rdouble(radiusX)
         self.radiusY = rdouble(radiusY)
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
-    ##
-    # overridden, @See ShapeData#setROIGeometry
-    #
-    def setROIGeometry(self, ellipse):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        ellipse.setTheZ(self.coord.theZ)
-        ellipse.setTheT(self.coord.theT)
-        ellipse.setX(self.x)
-        ellipse.setY(self.y)
-        ellipse.setRadiusX(self.radiusX)
-        ellipse.setRadiusY(self.radiusY)
-
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.x = roi.getX()
-        self.y = roi.getY()
-        self.radiusX = roi.getRadiusX()
-        self.radiusY = roi.getRadiusY()
-
     ##
     # overridden, @See ShapeData#createBaseType
     #
@@ -488,6 +561,15 @@ class EllipseData(ShapeData, ROIDrawingI):
 
 class RectangleData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    _GEOMETRY_FIELDS = (
+        ('x', 'setX', 'getX'),
+        ('y', 'setY', 'getY'),
+        ('width', 'setWidth', 'getWidth'),
+        ('height', 'setHeight', 'getHeight'),
+    )
+
     ##
     # Constructor for RectangleData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
@@ -496,7 +578,7 @@ class RectangleData(ShapeData, ROIDrawingI):
     # @param width The width of the shape.
     # @param height The height of the shape.
 
-    def __init__(self, roicoord=ROICoordinate(), x=0, y=0, width=0, height=0):
+    def __init__(self, roicoord=None, x=0, y=0, width=0, height=0):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         ShapeData.__init__(self)
@@ -504,32 +586,10 @@ class RectangleData(ShapeData, ROIDrawingI):
         self.y = rdouble(y)
         self.width = rdouble(width)
         self.height = rdouble(height)
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
-    ##
-    # overridden, @See ShapeData#setGeometry
-    #
-    def setGeometry(self, rectangle):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        rectangle.setTheZ(self.coord.theZ)
-        rectangle.setTheT(self.coord.theT)
-        rectangle.setX(self.x)
-        rectangle.setY(self.y)
-        rectangle.setWidth(self.width)
-        rectangle.setHeight(self.height)
-
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.x = roi.getX()
-        self.y = roi.getY()
-        self.width = roi.getWidth()
-        self.height = roi.getHeight()
-
     ##
     # overridden, @See ShapeData#createBaseType
     #
@@ -556,6 +616,15 @@ class RectangleData(ShapeData, ROIDrawingI):
 
 class LineData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('x1', 'y1', 'x2', 'y2')
+
+    _GEOMETRY_FIELDS = (
+        ('x1', 'setX1', 'getX1'),
+        ('y1', 'setY1', 'getY1'),
+        ('x2', 'setX2', 'getX2'),
+        ('y2', 'setY2', 'getY2'),
+    )
+
     ##
     # Constructor for LineData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
@@ -564,7 +633,7 @@ class LineData(ShapeData, ROIDrawingI):
     # @param x2 The second x  coordinate of the shape.
     # @param y2 The second y coordinate of the shape.
 
-    def __init__(self, roicoord=ROICoordinate(), x1=0, y1=0, x2=0, y2=0):
+    def __init__(self, roicoord=None, x1=0, y1=0, x2=0, y2=0):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         ShapeData.__init__(self)
@@ -572,32 +641,10 @@ class LineData(ShapeData, ROIDrawingI):
         self.y1 = rdouble(y1)
         self.x2 = rdouble(x2)
         self.y2 = rdouble(y2)
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
-    ##
-    # overridden, @See ShapeData#setGeometry
-    #
-    def setGeometry(self, line):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        line.setTheZ(self.coord.theZ)
-        line.setTheT(self.coord.theT)
-        line.setX1(self.x1)
-        line.setY1(self.y1)
-        line.setX2(self.x2)
-        line.setY2(self.y2)
-
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.x1 = roi.getX1()
-        self.y1 = roi.getY1()
-        self.x2 = roi.getX2()
-        self.y2 = roi.getY2()
-
     ##
     # overridden, @See ShapeData#createBaseType
     #
@@ -625,6 +672,16 @@ class LineData(ShapeData, ROIDrawingI):
 
 class MaskData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('x', 'y', 'width', 'height', 'bytesdata')
+
+    _GEOMETRY_FIELDS = (
+        ('x', 'setX', 'getX'),
+        ('y', 'setY', 'getY'),
+        ('width', 'setWidth', 'getWidth'),
+        ('height', 'setHeight', 'getHeight'),
+        ('bytesdata', 'setBytes', 'getBytes'),
+    )
+
     ##
     # Constructor for MaskData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
@@ -634,7 +691,7 @@ class MaskData(ShapeData, ROIDrawingI):
     # @param width The width of the shape.
     # @param height The height of the shape.
 
-    def __init__(self, roicoord=ROICoordinate(), bytes=None,
+    def __init__(self, roicoord=None, bytes=None,
                  x=0, y=0, width=0, height=0):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
@@ -644,34 +701,10 @@ class MaskData(ShapeData, ROIDrawingI):
         self.width = rdouble(width)
         self.height = rdouble(height)
         self.bytesdata = bytes
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
-    ##
-    # overridden, @See ShapeData#setGeometry
-    #
-    def setGeometry(self, mask):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        mask.setTheZ(self.coord.theZ)
-        mask.setTheT(self.coord.theT)
-        mask.setX(self.x)
-        mask.setY(self.y)
-        mask.setWidth(self.width)
-        mask.setHeight(self.height)
-        mask.setBytes(self.bytedata)
-
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.x = roi.getX()
-        self.y = roi.getY()
-        self.width = roi.getWidth()
-        self.height = roi.getHeight()
-        self.bytesdata = roi.getBytes()
-
     ##
     # overridden, @See ShapeData#createBaseType
     #
@@ -700,40 +733,29 @@ class MaskData(ShapeData, ROIDrawingI):
 
 class PointData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('x', 'y')
+
+    _GEOMETRY_FIELDS = (
+        ('x', 'setX', 'getX'),
+        ('y', 'setY', 'getY'),
+    )
+
     ##
     # Constructor for PointData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
     # @param x The x coordinate of the shape.
     # @param y The y coordinate of the shape.
 
-    def __init__(self, roicoord=ROICoordinate(), x=0, y=0):
+    def __init__(self, roicoord=None, x=0, y=0):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         ShapeData.__init__(self)
         self.x = rdouble(x)
         self.y = rdouble(y)
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
-    ##
-    # overridden, @See ShapeData#setGeometry
-    #
-    def setGeometry(self, point):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        point.setTheZ(self.coord.theZ)
-        point.setTheT(self.coord.theT)
-        point.setX(self.x)
-        point.setY(self.y)
-
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.x = roi.getX()
-        self.y = roi.getY()
-
     ##
     # overridden, @See ShapeData#createBaseType
     #
@@ -761,36 +783,39 @@ class PointData(ShapeData, ROIDrawingI):
 
 class PolygonData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('_points', '_pointsCache')
+
+    _GEOMETRY_FIELDS = (
+        ('points', 'setPoints', 'getPoints'),
+    )
+
     ##
     # Constructor for PolygonData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
     # @param pointList The list of points that make up the polygon,
     #                  as pairs [x1, y1, x2, y2 ..].
 
-    def __init__(self, roicoord=ROICoordinate(), pointsList=(0, 0)):
+    def __init__(self, roicoord=None, pointsList=(0, 0)):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         ShapeData.__init__(self)
         self.points = rstring(self.listToString(pointsList))
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
     ##
-    # overridden, @See ShapeData#setGeometry
+    # The points rstring. Assigning it drops the points parsed by
+    # getPointsList.
     #
-    def setGeometry(self, polygon):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        polygon.setTheZ(self.coord.theZ)
-        polygon.setTheT(self.coord.theT)
-        polygon.setPoints(self.points)
+    @property
+    def points(self):
+        return self._points
 
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.points = roi.getPoints()
+    @points.setter
+    def points(self, points):
+        self._points = points
+        self._pointsCache = None
 
     ##
     # Convert a pointsList[x1,y1,x2,y2..] to a string.
@@ -799,14 +824,7 @@ class PolygonData(ShapeData, ROIDrawingI):
     def listToString(self, pointsList):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        string = ''
-        cnt = 0
-        for element in pointsList:
-            if(cnt != 0):
-                string = string + ','
-            cnt += 1
-            string = string + str(element)
-        return string
+        return _pointsToString(pointsList)
 
     ##
     # Convert a string of points to a tuple list [(x1,y1),(x2,y2)..].
@@ -815,13 +833,19 @@ class PolygonData(ShapeData, ROIDrawingI):
     def stringToTupleList(self, pointString):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        elements = []
-        list = pointString.split(',')
-        numTokens = len(list)
-        for tokenPair in range(0, old_div(numTokens, 2)):
-            elements.append(
-                (int(list[tokenPair * 2]), int(list[tokenPair * 2 + 1])))
-        return elements
+        return _pointsToTupleList(pointString)
+
+    ##
+    # Get the points as a tuple ((x1,y1),(x2,y2)..). The tuple is parsed
+    # once and kept until the points are assigned.
+    # @return See above.
+    def getPointsList(self):
+        warnings.warn(
+            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
+        if self._pointsCache is None:
+            self._pointsCache = tuple(self.stringToTupleList(
+                self._points.getValue()))
+        return self._pointsCache
 
     ##
     # overridden, @See ShapeData#createBaseType
@@ -837,8 +861,8 @@ class PolygonData(ShapeData, ROIDrawingI):
     def acceptVisitor(self, visitor):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        visitor.drawPolygon(self.stringToTupleList(
-            self.points.getValue()), self.shapeSettings.getSettings())
+        visitor.drawPolygon(
+            self.getPointsList(), self.shapeSettings.getSettings())
 
 ##
 # The PolylineData class contains all the manipulation and create of PolylineI
@@ -849,36 +873,39 @@ class PolygonData(ShapeData, ROIDrawingI):
 
 class PolylineData(ShapeData, ROIDrawingI):
 
+    __slots__ = ('_points', '_pointsCache')
+
+    _GEOMETRY_FIELDS = (
+        ('points', 'setPoints', 'getPoints'),
+    )
+
     ##
     # Constructor for PolylineData object.
     # @param roicoord The ROICoordinate of the object (default: 0,0)
     # @param pointList The list of points that make up the polygon,
     #                  as pairs [x1, y1, x2, y2 ..].
 
-    def __init__(self, roicoord=ROICoordinate(), pointsList=(0, 0)):
+    def __init__(self, roicoord=None, pointsList=(0, 0)):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
         ShapeData.__init__(self)
         self.points = rstring(self.listToString(pointsList))
+        if roicoord is None:
+            roicoord = ROICoordinate()
         self.setCoord(roicoord)
 
     ##
-    # overridden, @See ShapeData#setGeometry
+    # The points rstring. Assigning it drops the points parsed by
+    # getPointsList.
     #
-    def setGeometry(self, point):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        point.setTheZ(self.coord.theZ)
-        point.setTheT(self.coord.theT)
-        point.setPoints(self.points)
+    @property
+    def points(self):
+        return self._points
 
-    ##
-    # overridden, @See ShapeData#getGeometryFromROI
-    #
-    def getGeometryFromROI(self, roi):
-        warnings.warn(
-            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        self.points = roi.getPoints()
+    @points.setter
+    def points(self, points):
+        self._points = points
+        self._pointsCache = None
 
     ##
     # Convert a pointsList[x1,y1,x2,y2..] to a string.
@@ -887,14 +914,7 @@ class PolylineData(ShapeData, ROIDrawingI):
     def listToString(self, pointsList):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        string = ''
-        cnt = 0
-        for element in pointsList:
-            if(cnt > 0):
-                string = string + ','
-            string = string + str(element)
-            cnt += 1
-        return string
+        return _pointsToString(pointsList)
 
     ##
     # Convert a string of points to a tuple list [(x1,y1),(x2,y2)..].
@@ -903,13 +923,19 @@ class PolylineData(ShapeData, ROIDrawingI):
     def stringToTupleList(self, pointString):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        elements = []
-        list = pointString.split(',')
-        numTokens = len(list)
-        for tokenPair in range(0, old_div(numTokens, 2)):
-            elements.append(
-                (int(list[tokenPair * 2]), int(list[tokenPair * 2 + 1])))
-        return elements
+        return _pointsToTupleList(pointString)
+
+    ##
+    # Get the points as a tuple ((x1,y1),(x2,y2)..). The tuple is parsed
+    # once and kept until the points are assigned.
+    # @return See above.
+    def getPointsList(self):
+        warnings.warn(
+            "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
+        if self._pointsCache is None:
+            self._pointsCache = tuple(self.stringToTupleList(
+                self._points.getValue()))
+        return self._pointsCache
 
     ##
     # overridden, @See ShapeData#createBaseType
@@ -925,5 +951,5 @@ class PolylineData(ShapeData, ROIDrawingI):
     def acceptVisitor(self, visitor):
         warnings.warn(
             "This module is deprecated as of OMERO 5.3.0", DeprecationWarning)
-        visitor.drawPolyline(self.stringToTupleList(
-            self.points.getValue()), self.shapeSettings.getSettings())
+        visitor.drawPolyline(
+            self.getPointsList(), self.shapeSettings.getSettings())
@@ -17,12 +17,15 @@ from builtins import str
 from builtins import range
 from builtins import object
 from past.utils import old_div
+import io
 import os
 import pytest
+import struct
 import sys
 from omero_ext.path import path
 import omero.clients
 import uuid
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 from omero.cli import CLI, NonZeroReturnCode
 from omero.util import import_candidates
 
@@ -68,6 +71,26 @@ class MockClient(omero.clients.BaseClient):
         return self._uuid
 
 
+class MockResponse(object):
+
+    def __init__(self, status_code, headers=None, content=b""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.content
+
+
 class TestImport(object):
 
     def setup_method(self, method):
@@ -448,6 +471,137 @@ class TestImport(object):
         self.add_client_dir()
         self.cli.invoke(self.args, strict=True)
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    def testBulkBatch(self):
+        # Paths are grouped into a single Java process per batch
+        t = path(__file__).parent / "bulk_import" / "test_batch"
+        b = t / "bulk.yml"
+        calls = []
+
+        class MockImportControl(ImportControl):
+            def do_import(self, command_args, xargs, mode):
+                calls.append(command_args.path)
+        self.cli.register("mock-import", MockImportControl, "HELP")
+
+        self.args = ["mock-import", "-f", "---bulk=%s" % b]
+        self.add_client_dir()
+        self.cli.invoke(self.args, strict=True)
+        assert calls == [["1.fake", "2.fake"], ["3.fake"]]
+
+    @pytest.mark.parametrize('batch', ("two", "0", "-1", "2.5", "true"))
+    def testBulkBadBatch(self, tmpdir, capfd, batch):
+        tmpdir.join("paths.txt").write("1.fake\n")
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.txt\nbatch: %s\n" % batch)
+
+        self.add_client_dir()
+        self.args += ["-f", "---bulk=%s" % b]
+        with pytest.raises(NonZeroReturnCode):
+            self.cli.invoke(self.args, strict=True)
+        o, e = capfd.readouterr()
+        assert "batch must be a positive integer" in e
+
+    def testResolve(self, tmpdir):
+        args = self.cli.parser.parse_args(["import", "-f", "test.fake"])
+        command_args = CommandArguments(self.cli, args)
+        assert command_args.resolve("out.log") == "out.log"
+        command_args.cwd = str(tmpdir)
+        assert command_args.resolve("out.log") == str(tmpdir.join("out.log"))
+        absolute = str(tmpdir.join("elsewhere", "out.log"))
+        assert command_args.resolve(absolute) == absolute
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    def testBulkChdir(self, tmpdir, monkeypatch):
+        # Java and the log files use the directory of the bulk file but
+        # the working directory of the Python process is left alone
+        launches = self.mkpopen(monkeypatch)
+        bulk_dir = tmpdir.join("bulk")
+        bulk_dir.mkdir()
+        bulk_dir.join("paths.txt").write("1.fake\n")
+        b = bulk_dir.join("bulk.yml")
+        b.write("path: paths.txt\n")
+        elsewhere = tmpdir.join("elsewhere")
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)
+
+        self.args += ["-f", "---bulk=%s" % b, "---file=out.log"]
+        self.args += ["--clientdir", str(self.mkclientdir(tmpdir))]
+        self.cli.invoke(self.args, strict=True)
+        assert [launch["chdir"] for launch in launches] == [str(bulk_dir)]
+        assert launches[0]["command"][-1] == "1.fake"
+        assert bulk_dir.join("out.log").exists()
+        assert os.getcwd() == str(elsewhere)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    @pytest.mark.parametrize('newline', ("\n", "\r\n", "\r"))
+    def testBulkPathNewlines(self, tmpdir, newline):
+        # Path files use universal newlines and may omit the final newline
+        tmpdir.join("paths.txt").write_binary(
+            newline.join(["1.fake", "2.fake"]).encode("utf-8"))
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.txt\n")
+        calls = []
+
+        class MockImportControl(ImportControl):
+            def do_import(self, command_args, xargs, mode):
+                calls.append(command_args.path)
+        self.cli.register("mock-import", MockImportControl, "HELP")
+
+        self.args = ["mock-import", "-f", "---bulk=%s" % b]
+        self.add_client_dir()
+        self.cli.invoke(self.args, strict=True)
+        assert calls == [["1.fake"], ["2.fake"]]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    @pytest.mark.parametrize('ext, sep', (
+        ("tsv", "\t"), ("csv", ","), ("txt", " ")))
+    def testBulkShortRow(self, tmpdir, capfd, ext, sep):
+        # Rows with fewer values than columns stop the import
+        tmpdir.join("paths.%s" % ext).write(
+            "meta_one%s1.fake\nmeta_two\n" % sep)
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.%s\ncolumns:\n- name\n- path\n" % ext)
+        calls = []
+
+        class MockImportControl(ImportControl):
+            def do_import(self, command_args, xargs, mode):
+                calls.append(command_args.java_args())
+        self.cli.register("mock-import", MockImportControl, "HELP")
+
+        self.args = ["mock-import", "-f", "---bulk=%s" % b]
+        self.args += ["--clientdir", str(self.mkclientdir(tmpdir))]
+        with pytest.raises(NonZeroReturnCode):
+            self.cli.invoke(self.args, strict=True)
+        o, e = capfd.readouterr()
+        assert "Expected 2 columns" in e
+        assert len(calls) == 1
+        assert "--name=meta_one" in calls[0]
+        assert calls[0][-1] == "1.fake"
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    @pytest.mark.parametrize('skip, expected', (
+        ("thumbnails", ["--no-thumbnails"]),
+        ("[all, thumbnails]", sorted(arg for name, arg in plugin.SKIP_ARGS)),
+    ))
+    def testBulkSkipValues(self, tmpdir, skip, expected):
+        # A single value is one step and repeated steps add one flag
+        tmpdir.join("paths.txt").write("1.fake\n")
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.txt\nskip: %s\n" % skip)
+        calls = []
+
+        class MockImportControl(ImportControl):
+            def do_import(self, command_args, xargs, mode):
+                calls.append(command_args.java_args())
+        self.cli.register("mock-import", MockImportControl, "HELP")
+
+        self.args = ["mock-import", "-f", "---bulk=%s" % b]
+        self.args += ["--skip", "thumbnails"]
+        self.args += ["--clientdir", str(self.mkclientdir(tmpdir))]
+        self.cli.invoke(self.args, strict=True)
+        flags = frozenset(arg for name, arg in plugin.SKIP_ARGS)
+        assert sorted(arg for arg in calls[0] if arg in flags) == expected
+
     def testBulkBad(self):
         t = path(__file__).parent / "bulk_import" / "test_bad"
         b = old_div(t, "bulk.yml")
@@ -468,6 +622,49 @@ class TestImport(object):
         o, e = capfd.readouterr()
         assert o == '"--name=no-op" "1.fake"\n'
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    @pytest.mark.parametrize('template, expected', (
+        ("all.sh", {"all.sh": ["1.fake", "2.fake"]}),
+        ("%s.sh", {"1.sh": ["1.fake"], "2.sh": ["2.fake"]}),
+    ))
+    def testBulkDryFiles(self, tmpdir, monkeypatch, template, expected):
+        # Command files are written next to the bulk file, either all
+        # together or one numbered file per import
+        bulk_dir = tmpdir.join("bulk")
+        bulk_dir.mkdir()
+        bulk_dir.join("paths.txt").write("1.fake\n2.fake\n")
+        b = bulk_dir.join("bulk.yml")
+        b.write("path: paths.txt\ndry_run: \"%s\"\n" % template)
+        monkeypatch.chdir(tmpdir)
+
+        self.add_client_dir()
+        self.args += ["-f", "---bulk=%s" % b]
+        self.cli.invoke(self.args, strict=True)
+        assert sorted(f.basename for f in bulk_dir.listdir()) == \
+            sorted(["bulk.yml", "paths.txt"] + list(expected))
+        for name, paths in expected.items():
+            lines = bulk_dir.join(name).read().splitlines()
+            assert [line.rsplit(" import ", 1)[1] for line in lines] == \
+                ['"%s"' % p for p in paths]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    @pytest.mark.parametrize('template', ("all.sh", "%s.sh"))
+    def testBulkDryFilesShortRow(self, tmpdir, template):
+        # Commands collected before a failing row are still written
+        tmpdir.join("paths.tsv").write("meta_one\t1.fake\nmeta_two\n")
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.tsv\ndry_run: \"%s\"\ncolumns:\n- name\n"
+                "- path\n" % template)
+
+        self.add_client_dir()
+        self.args += ["-f", "---bulk=%s" % b]
+        with pytest.raises(NonZeroReturnCode):
+            self.cli.invoke(self.args, strict=True)
+        lines = tmpdir.join(template.replace("%s", "1")).read().splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith('"--name=meta_one" "1.fake"')
+        assert not tmpdir.join("2.sh").exists()
+
     @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
     def testBulkJavaArgs(self):
         """Test Java arguments"""
@@ -515,6 +712,327 @@ class TestImport(object):
         self.add_client_dir()
         self.cli.invoke(self.args, strict=True)
 
+    @pytest.mark.parametrize('arg', (
+        "--transfer=inplace",
+        "--exclude=clientpaths",
+        "--checksum-algorithm=MD5",
+    ))
+    def testUnknownChoices(self, capfd, arg):
+        self.args += ["-f", arg, "test.fake"]
+        with pytest.raises(NonZeroReturnCode):
+            self.cli.invoke(self.args, strict=True)
+        o, e = capfd.readouterr()
+        assert "or use --force" in e
+
+    def testDownloadRevalidate(self, tmpdir, monkeypatch, capfd):
+        # A downloaded OMERO.java.zip is revalidated with the stored ETag
+        # and Last-Modified values and is not fetched again on a 304
+        monkeypatch.setenv("OMERO_USERDIR", str(tmpdir))
+        archive = io.BytesIO()
+        with ZipFile(archive, "w") as zipfile:
+            zipfile.writestr("OMERO.java-test/libs/test.jar", "jar")
+        etag = '"abc"'
+        modified = "Wed, 01 Jan 2020 00:00:00 GMT"
+        sent = []
+
+        def get(url, headers=None, stream=False):
+            sent.append(headers)
+            if headers:
+                return MockResponse(304)
+            return MockResponse(
+                200, {"ETag": etag, "Last-Modified": modified},
+                archive.getvalue())
+        monkeypatch.setattr(plugin.requests, "get", get)
+
+        # An archive being downloaded by another import is left alone
+        jars = tmpdir.join("cache", "jars")
+        jars.ensure(dir=True)
+        other = jars.join("OMERO.java.other.part")
+        other.write("")
+
+        control = ImportControl(self.cli)
+        url = "https://example.org/OMERO.java.zip"
+        control.download_omero_java(url)
+        assert jars.join("OMERO.java-test", "libs", "test.jar").read() == "jar"
+        assert jars.join("OMERO.java.txt").read() == "OMERO.java-test"
+        assert jars.join("OMERO.java.etag").read().splitlines() == [
+            url, etag, modified]
+        assert jars.listdir("*.part") == [other]
+        assert sent == [{}]
+
+        capfd.readouterr()
+        control.download_omero_java(url)
+        assert sent[1] == {
+            "If-None-Match": etag, "If-Modified-Since": modified}
+        o, e = capfd.readouterr()
+        assert "Using cached OMERO.java-test" in e
+
+        # The stored values only apply to the URL they came from
+        control.download_omero_java(url + "?v=2")
+        assert sent[2] == {}
+
+        # Nor once the extracted JARs have gone
+        jars.join("OMERO.java-test").remove()
+        control.download_omero_java(url)
+        assert sent[3] == {}
+
+        # An interrupted extraction leaves no sidecar behind so the
+        # partial JARs are not revalidated
+        def interrupted(zip_path, members, dest):
+            os.makedirs(
+                os.path.join(dest, "OMERO.java-test", "libs"), exist_ok=True)
+            raise KeyboardInterrupt()
+        monkeypatch.setattr(control, "_extract_parallel", interrupted)
+        jars.join("OMERO.java-test").remove()
+        for i in range(2):
+            with pytest.raises(KeyboardInterrupt):
+                control.download_omero_java(url)
+        assert sent[4:] == [{}, {}]
+        assert not jars.join("OMERO.java.etag").exists()
+
+    @pytest.mark.parametrize('names, tops', (
+        (["OMERO.java-a/libs/a.jar", "OMERO.java-b/libs/b.jar"],
+         "['OMERO.java-a', 'OMERO.java-b']"),
+        (["OMERO.java-a/libs/a.jar", "a.jar"], "['OMERO.java-a', 'a.jar']"),
+        (["a.jar"], "['a.jar']"),
+        ([], "[]"),
+    ))
+    def testDownloadTopdir(self, tmpdir, monkeypatch, capfd, names, tops):
+        # Archives must hold a single top directory with everything in it
+        monkeypatch.setenv("OMERO_USERDIR", str(tmpdir))
+        archive = io.BytesIO()
+        with ZipFile(archive, "w") as zipfile:
+            for name in names:
+                zipfile.writestr(name, "jar")
+        monkeypatch.setattr(
+            plugin.requests, "get", lambda url, headers=None, stream=False:
+            MockResponse(200, content=archive.getvalue()))
+
+        control = ImportControl(self.cli)
+        with pytest.raises(NonZeroReturnCode):
+            control.download_omero_java("https://example.org/OMERO.java.zip")
+        o, e = capfd.readouterr()
+        assert "Expected one top directory in OMERO.java.zip: %s" % tops in e
+        jars = tmpdir.join("cache", "jars")
+        assert jars.listdir() == []
+
+    def testClasspathCache(self, tmpdir):
+        client_dir = tmpdir.join("client")
+        client_dir.mkdir()
+        client_dir.join("a.jar").write("")
+        client_dir.join("notes.txt").write("")
+        control = ImportControl(self.cli)
+
+        classpath = control._get_jars(str(client_dir))
+        assert classpath == [str(client_dir.join("a.jar"))]
+        cache = client_dir.join(plugin.CLASSPATH_CACHE)
+        assert cache.read().splitlines() == [
+            str(client_dir), "1", str(client_dir.join("a.jar"))]
+        assert [f.basename for f in client_dir.listdir()
+                if f.ext == ".tmp"] == []
+
+        def rewrite(text):
+            # Rewriting the cache file leaves the directory mtime alone
+            # so only the stamp on the file itself has to be restored
+            cache.write(text)
+            mtime = os.stat(str(client_dir)).st_mtime_ns
+            os.utime(str(cache), ns=(mtime, mtime))
+
+        # A hit returns the cached value rather than rescanning
+        rewrite("%s\n1\n/cached.jar\n" % client_dir)
+        assert control._get_jars(str(client_dir)) == ["/cached.jar"]
+
+        # Truncated files are rescanned
+        rewrite("%s\n2\n/cached.jar\n" % client_dir)
+        assert control._get_jars(str(client_dir)) == [
+            str(client_dir.join("a.jar"))]
+        rewrite("%s\n1\n/cac" % client_dir)
+        assert control._get_jars(str(client_dir)) == [
+            str(client_dir.join("a.jar"))]
+
+        # Adding a JAR changes the directory mtime. It is set explicitly
+        # in case both changes fall within one timestamp tick
+        client_dir.join("b.jar").write("")
+        mtime = os.stat(str(client_dir)).st_mtime_ns + 10 ** 9
+        os.utime(str(client_dir), ns=(mtime, mtime))
+        assert sorted(control._get_jars(str(client_dir))) == [
+            str(client_dir.join("a.jar")), str(client_dir.join("b.jar"))]
+
+    def testClassSharingArgs(self, tmpdir, monkeypatch):
+        # Keep the dumped archive out of any real user directory
+        monkeypatch.setenv("OMERO_USERDIR", str(tmpdir))
+        control = ImportControl(self.cli)
+        classpath = ["/a.jar", "/b.jar"]
+        xargs = control._class_sharing_args(classpath)
+        assert len(xargs) == 1
+        assert xargs[0].startswith("-XX:ArchiveClassesAtExit=")
+        jsa = path(xargs[0].split("=", 1)[1])
+
+        # Once the archive has been dumped it is reused
+        jsa.write_text("")
+        assert control._class_sharing_args(classpath) == [
+            "-XX:SharedArchiveFile=%s" % jsa, "-Xshare:auto"]
+
+        # A different classpath uses a different archive
+        xargs = control._class_sharing_args(classpath + ["/c.jar"])
+        assert xargs[0].startswith("-XX:ArchiveClassesAtExit=")
+        assert xargs[0] != "-XX:ArchiveClassesAtExit=%s" % jsa
+
+    def mkpopen(self, monkeypatch):
+        """
+        Replace omero.java.popen with a fake which records the arguments
+        of each launch. Like Java, the fake dumps the class sharing
+        archive when the process exits.
+        """
+        launches = []
+
+        class MockProcess(object):
+            def __init__(self, xargs):
+                self.xargs = xargs
+
+            def wait(self):
+                for arg in self.xargs:
+                    if arg.startswith("-XX:ArchiveClassesAtExit="):
+                        path(arg.split("=", 1)[1]).write_text("")
+                return 0
+
+        def popen(command, debug=False, xargs=None, chdir=None, **kwargs):
+            launches.append(dict(command=command, xargs=xargs, chdir=chdir))
+            return MockProcess(xargs)
+
+        monkeypatch.setattr(plugin.omero.java, "popen", popen)
+        return launches
+
+    def mkclientdir(self, tmpdir):
+        client_dir = tmpdir.join("client")
+        client_dir.mkdir()
+        client_dir.join("fake.jar").write("")
+        return client_dir
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
+    def testBulkClassSharing(self, tmpdir, monkeypatch):
+        # Only the first Java process of a bulk import dumps the archive
+        monkeypatch.setenv("OMERO_USERDIR", str(tmpdir.join("userdir")))
+        launches = self.mkpopen(monkeypatch)
+        tmpdir.join("paths.txt").write("1.fake\n2.fake\n3.fake\n")
+        b = tmpdir.join("bulk.yml")
+        b.write("path: paths.txt\n")
+
+        self.args += ["-f", "--class-sharing", "---bulk=%s" % b]
+        self.args += ["--clientdir", str(self.mkclientdir(tmpdir))]
+        self.cli.invoke(self.args, strict=True)
+
+        flags = [[x for x in launch["xargs"] if x.startswith("-XX:")]
+                 for launch in launches]
+        assert len(flags) == 3
+        assert flags[0][0].startswith("-XX:ArchiveClassesAtExit=")
+        jsa = flags[0][0].split("=", 1)[1]
+        assert flags[1] == flags[2] == ["-XX:SharedArchiveFile=%s" % jsa]
+
+    def testExtractParallelNoDirEntries(self, tmpdir, monkeypatch):
+        # Parents which are only implied by the file names are created
+        # before the workers start rather than by each zipfile.extract()
+        monkeypatch.setattr(plugin, "isal_zlib", None)
+        zip_path = str(tmpdir.join("test.zip"))
+        names = ["top/d%s/f%s.txt" % (i % 4, i) for i in range(64)]
+        with ZipFile(zip_path, "w") as zipfile:
+            for name in names:
+                zipfile.writestr(name, name)
+        dest = tmpdir.join("out")
+        dest.mkdir()
+        ImportControl(self.cli)._extract_parallel(zip_path, names, str(dest))
+        for name in names:
+            assert dest.join(name).read() == name
+
+    @pytest.mark.parametrize('descriptors', (False, True))
+    @pytest.mark.parametrize('use_isal', (False, True))
+    def testExtractParallelIsal(self, tmpdir, monkeypatch, use_isal,
+                                descriptors):
+        # Members inflated with isal match those extracted by zipfile
+        isal_zlib = None
+        if use_isal:
+            isal_zlib = pytest.importorskip("isal.isal_zlib")
+        monkeypatch.setattr(plugin, "isal_zlib", isal_zlib)
+
+        class UnseekableFile(object):
+            # Without seek() zipfile writes a data descriptor after
+            # each member instead of updating the local header
+            def __init__(self, fh):
+                self.fh = fh
+
+            def write(self, data):
+                return self.fh.write(data)
+
+            def tell(self):
+                return self.fh.tell()
+
+            def flush(self):
+                self.fh.flush()
+
+        # An extra field moves the data away from the fixed size header
+        extra = struct.pack("<HH", 0xcafe, 4) + b"test"
+        members = [
+            ("top/deflated.txt", b"deflated " * 1000, ZIP_DEFLATED, b""),
+            ("top/stored.txt", b"stored " * 100, ZIP_STORED, b""),
+            ("top/empty.txt", b"", ZIP_DEFLATED, b""),
+            ("top/extra.txt", b"extra " * 100, ZIP_DEFLATED, extra),
+            # Larger than one read from the archive once compressed
+            ("top/large.bin", os.urandom(3 * 2 ** 19), ZIP_DEFLATED, b""),
+            (u"top/\u00fcn\u00efc\u00f6d\u00e9/\u30d5\u30a1\u30a4\u30eb.txt",
+             u"\u00fcn\u00efc\u00f6d\u00e9".encode("utf-8") * 100,
+             ZIP_DEFLATED, b""),
+        ]
+        # Names which zipfile sanitises are always extracted by zipfile
+        unusual = [
+            ("top/./dot.txt", b"dot " * 100, ZIP_DEFLATED, b""),
+            ("top/question?.txt", b"question " * 100, ZIP_DEFLATED, b""),
+        ]
+        members += unusual
+        zip_path = str(tmpdir.join("test.zip"))
+        with open(zip_path, "wb") as fh:
+            target = UnseekableFile(fh) if descriptors else fh
+            with ZipFile(target, "w") as zipfile:
+                for name, data, compress_type, extra in members:
+                    info = ZipInfo(name, date_time=(2020, 1, 1, 0, 0, 0))
+                    info.extra = extra
+                    zipfile.writestr(info, data, compress_type=compress_type)
+
+        expected = tmpdir.join("expected")
+        with ZipFile(zip_path) as zipfile:
+            for info in zipfile.infolist():
+                assert bool(info.flag_bits & 0x08) == descriptors
+            zipfile.extractall(str(expected))
+
+        inflated = []
+        inflate_isal = ImportControl._inflate_isal
+
+        def spy(this, raw, info, target):
+            rv = inflate_isal(this, raw, info, target)
+            if rv:
+                inflated.append(info.filename)
+            return rv
+        monkeypatch.setattr(ImportControl, "_inflate_isal", spy)
+
+        actual = tmpdir.join("actual")
+        actual.mkdir()
+        names = [member[0] for member in members]
+        ImportControl(self.cli)._extract_parallel(zip_path, names, str(actual))
+        # Every file is where zipfile.extractall() puts it
+        assert sorted(f.relto(actual) for f in actual.visit()) == \
+            sorted(f.relto(expected) for f in expected.visit())
+        for f in expected.visit(lambda f: f.isfile()):
+            assert actual.join(f.relto(expected)).read_binary() == \
+                f.read_binary()
+        for name, data, compress_type, extra in members:
+            if (name, data, compress_type, extra) not in unusual:
+                assert actual.join(name).read_binary() == data
+        if use_isal:
+            assert sorted(inflated) == sorted(
+                member[0] for member in members
+                if member[2] == ZIP_DEFLATED and member not in unusual)
+        else:
+            assert inflated == []
+
     @pytest.mark.skipif(sys.platform == "win32", reason="Fails on Windows")
     def testImportCandidates(self, tmpdir):
         """test using import_candidates from util
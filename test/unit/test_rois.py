@@ -23,7 +23,14 @@
 Simple tests of various ROI utilities
 """
 
+import pytest
 from builtins import object
+from omero.model import EllipseI, LineI, MaskI, PointI, PolygonI, PolylineI
+from omero.model import RectangleI
+from omero.rtypes import rint, rstring
+from omero.util.ROI_utils import EllipseData, LineData, MaskData, PointData
+from omero.util.ROI_utils import PolygonData, PolylineData, RectangleData
+from omero.util.ROI_utils import ROICoordinate, ShapeSettingsData
 from omero.util.ROI_utils import pointsStringToXYlist, xyListToBbox
 from omero.util.roi_handling_utils import points_string_to_xy_list
 
@@ -60,3 +67,169 @@ class TestRoiUtils(object):
             "1,2 3,4 5,6"
         ))
         assert xy_list == [(1, 2), (3, 4), (5, 6)]
+
+
+SHAPES = (
+    (EllipseData, EllipseI, dict(x=1, y=2, radiusX=3, radiusY=4)),
+    (RectangleData, RectangleI, dict(x=1, y=2, width=3, height=4)),
+    (LineData, LineI, dict(x1=1, y1=2, x2=3, y2=4)),
+    (MaskData, MaskI, dict(x=1, y=2, width=3, height=4, bytes=b"mask")),
+    (PointData, PointI, dict(x=1, y=2)),
+    (PolygonData, PolygonI, dict(pointsList=[1, 2, 3, 4])),
+    (PolylineData, PolylineI, dict(pointsList=[1, 2, 3, 4])),
+)
+
+
+def unwrap(value):
+    if hasattr(value, "getValue"):
+        return value.getValue()
+    return value
+
+
+class TestShapeData(object):
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_get_roi(self, shape_class, roi_class, kwargs):
+        shape = shape_class(ROICoordinate(1, 2), **kwargs)
+        roi = shape.getROI()
+        assert isinstance(roi, roi_class)
+        assert shape.getROI() is roi
+        assert unwrap(roi.getTheZ()) == 1
+        assert unwrap(roi.getTheT()) == 2
+        assert unwrap(roi.getStrokeColor()) == ShapeSettingsData.GREY
+        for attr, setter, getter in shape_class._GEOMETRY_FIELDS:
+            assert unwrap(getattr(roi, getter)()) == \
+                unwrap(getattr(shape, attr))
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_get_roi_sets_coord_once(self, monkeypatch, shape_class,
+                                     roi_class, kwargs):
+        calls = []
+        set_roi_coord = ROICoordinate.setROICoord
+
+        def spy(coord, roi):
+            calls.append(roi)
+            set_roi_coord(coord, roi)
+        monkeypatch.setattr(ROICoordinate, "setROICoord", spy)
+        roi = shape_class(ROICoordinate(1, 2), **kwargs).getROI()
+        assert calls == [roi]
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_from_roi(self, shape_class, roi_class, kwargs):
+        roi = shape_class(ROICoordinate(1, 2), **kwargs).getROI()
+        shape = shape_class()
+        shape.fromROI(roi)
+        assert shape.getROI() is roi
+        assert unwrap(shape.coord.theZ) == 1
+        assert unwrap(shape.coord.theT) == 2
+        for attr, setter, getter in shape_class._GEOMETRY_FIELDS:
+            assert unwrap(getattr(shape, attr)) == \
+                unwrap(getattr(roi, getter)())
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_set_geometry(self, shape_class, roi_class, kwargs):
+        shape = shape_class(ROICoordinate(1, 2), **kwargs)
+        roi = roi_class()
+        shape.setGeometry(roi)
+        assert unwrap(roi.getTheZ()) == 1
+        for attr, setter, getter in shape_class._GEOMETRY_FIELDS:
+            assert unwrap(getattr(roi, getter)()) == \
+                unwrap(getattr(shape, attr))
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_slots(self, shape_class, roi_class, kwargs):
+        shape = shape_class(**kwargs)
+        assert not hasattr(shape, "__dict__")
+        with pytest.raises(AttributeError):
+            shape.typo = None
+
+    @pytest.mark.parametrize("shape_class, roi_class, kwargs", SHAPES)
+    def test_default_coord_not_shared(self, shape_class, roi_class, kwargs):
+        first = shape_class(**kwargs)
+        second = shape_class(**kwargs)
+        assert first.coord is not second.coord
+        first.coord.theZ = rint(5)
+        assert unwrap(second.coord.theZ) == 0
+
+    @pytest.mark.parametrize("shape_class", (PolygonData, PolylineData))
+    def test_points(self, shape_class):
+        shape = shape_class(pointsList=[1, 2, 3, 4])
+        assert shape.points.getValue() == "1,2,3,4"
+        assert list(shape.getPointsList()) == [(1, 2), (3, 4)]
+        assert shape.stringToTupleList("5,6,7,8,9") == [(5, 6), (7, 8)]
+        assert shape.stringToTupleList("5,6,") == [(5, 6)]
+        assert shape.stringToTupleList("") == []
+
+    @pytest.mark.parametrize("shape_class", (PolygonData, PolylineData))
+    def test_points_from_roi(self, shape_class):
+        shape = shape_class(pointsList=[1, 2, 3, 4])
+        shape.getPointsList()
+        shape.fromROI(shape_class(pointsList=[5, 6]).getROI())
+        assert list(shape.getPointsList()) == [(5, 6)]
+
+    @pytest.mark.parametrize("shape_class", (PolygonData, PolylineData))
+    def test_points_assigned(self, shape_class):
+        shape = shape_class(pointsList=[1, 2, 3, 4])
+        shape.getPointsList()
+        shape.points = rstring("5,6")
+        assert shape.getPointsList() == ((5, 6),)
+
+    @pytest.mark.parametrize("shape_class, draw", (
+        (PolygonData, "drawPolygon"),
+        (PolylineData, "drawPolyline"),
+    ))
+    def test_points_visitor(self, shape_class, draw):
+        drawn = []
+
+        class Visitor(object):
+            pass
+        visitor = Visitor()
+        setattr(visitor, draw, lambda points, settings: drawn.append(points))
+
+        shape = shape_class(pointsList=[1, 2, 3, 4])
+        shape.acceptVisitor(visitor)
+        shape.acceptVisitor(visitor)
+        # Every visitor is given the same immutable points
+        assert drawn[0] == drawn[1] == ((1, 2), (3, 4))
+        assert isinstance(drawn[0], tuple)
+
+
+class TestShapeSettingsData(object):
+
+    def test_settings_default(self):
+        grey = ShapeSettingsData.GREY
+        assert ShapeSettingsData().getSettings() == ((grey, 1), grey)
+
+    def test_settings_stroke_width_changed_in_place(self):
+        settings = ShapeSettingsData()
+        settings.getSettings()
+        settings.strokeWidth.setValue(5)
+        assert settings.getSettings()[0][1] == 5
+
+    def test_settings_colours_assigned(self):
+        settings = ShapeSettingsData()
+        settings.getSettings()
+        settings.strokeColour = rint(1)
+        settings.fillColour = rint(2)
+        assert settings.getSettings() == ((1, 1), 2)
+
+    def test_settings_setters(self):
+        settings = ShapeSettingsData()
+        settings.getSettings()
+        settings.setStrokeSettings(3, width=2)
+        settings.setFillSettings("#ffffff")
+        assert settings.getSettings() == ((3, 2), "#ffffff")
+
+    def test_settings_from_roi(self):
+        source = ShapeSettingsData()
+        source.setStrokeSettings(3, width=2)
+        source.fillColour = rint(4)
+        source.fillRule = rstring("evenodd")
+        shape = EllipseI()
+        source.setROIShapeSettings(shape)
+
+        settings = ShapeSettingsData()
+        settings.getSettings()
+        settings.getShapeSettingsFromROI(shape)
+        assert settings.getSettings() == ((3, 2), 4)
+        assert settings.fillRule.getValue() == "evenodd"